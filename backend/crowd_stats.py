@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from models import DriverStatus, RouteCrowdBucket, RouteVehicle
+
+DEFAULT_CAPACITY = 18
+
+# A vehicle counts as active on a route if it reported within this window
+ACTIVE_WINDOW = timedelta(minutes=10)
+
+# Sliding windows for crowd-level counts (label -> length).
+# Counts are kept in one-minute buckets, so a window can include up to one
+# extra minute at its old edge.
+CROWD_WINDOWS = {
+    "5m": timedelta(minutes=5),
+    "1h": timedelta(hours=1),
+}
+BUCKET = timedelta(minutes=1)
+MAX_WINDOW = max(CROWD_WINDOWS.values())
+
+CROWD_LEVELS = ("spacious", "crowded", "full", "unknown")
+
+
+def bucket_start(ts: datetime) -> datetime:
+    return ts.replace(second=0, microsecond=0)
+
+
+def crowd_level_column(level) -> str:
+    return level if level in CROWD_LEVELS else "unknown"
+
+
+def summarize_buckets(buckets, now: datetime) -> dict:
+    """
+    Add up minute buckets into per-window crowd-level counts.
+    A bucket counts towards a window if any part of its minute falls inside it.
+    Levels with no reports are left out.
+    """
+    result = {}
+    for label, window in CROWD_WINDOWS.items():
+        oldest = now - window - BUCKET
+        counts = {}
+        for b in buckets:
+            if b.bucket_start <= oldest:
+                continue
+            for level in CROWD_LEVELS:
+                n = getattr(b, level) or 0
+                if n:
+                    counts[level] = counts.get(level, 0) + n
+        result[label] = counts
+    return result
+
+
+def record_status(db: Session, status: DriverStatus, max_capacity: int = None):
+    """
+    Update the per-route aggregates for a new status row, in the caller's
+    transaction so every API worker sees the same numbers once it commits.
+
+    The aggregate writes run in a SAVEPOINT: if they fail, the error is
+    logged and only they are rolled back, so the status write itself still
+    goes through.
+    """
+    # Flush the status row outside the savepoint so its own errors still surface
+    db.flush()
+
+    reported_at = status.reported_at or datetime.now(timezone.utc)
+    try:
+        with db.begin_nested():
+            if not status.route_code:
+                # Driver is not on a route any more
+                db.query(RouteVehicle).filter(RouteVehicle.driver_id == status.driver_id).delete(
+                    synchronize_session=False
+                )
+                return
+
+            level = crowd_level_column(status.crowd_level)
+            bucket = bucket_start(reported_at)
+            stmt = insert(RouteCrowdBucket).values(route_code=status.route_code, bucket_start=bucket, **{level: 1})
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[RouteCrowdBucket.route_code, RouteCrowdBucket.bucket_start],
+                set_={level: RouteCrowdBucket.__table__.c[level] + 1},
+            ))
+
+            cap = max_capacity if max_capacity else DEFAULT_CAPACITY
+            stmt = insert(RouteVehicle).values(
+                driver_id=status.driver_id,
+                route_code=status.route_code,
+                occupancy_ratio=status.current_passenger_count / cap,
+                reported_at=reported_at,
+            )
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[RouteVehicle.driver_id],
+                set_={
+                    "route_code": stmt.excluded.route_code,
+                    "occupancy_ratio": stmt.excluded.occupancy_ratio,
+                    "reported_at": stmt.excluded.reported_at,
+                },
+                # Ignore a report that arrives after a newer one
+                where=RouteVehicle.reported_at <= stmt.excluded.reported_at,
+            ))
+
+            # Buckets older than the longest window are never read again
+            db.query(RouteCrowdBucket).filter(
+                RouteCrowdBucket.route_code == status.route_code,
+                RouteCrowdBucket.bucket_start < bucket - MAX_WINDOW,
+            ).delete(synchronize_session=False)
+    except Exception as e:
+        print(f"Failed to update crowd aggregates for driver {status.driver_id}: {e}")
+
+
+def route_crowd(db: Session, route_code: str, now: datetime = None) -> dict:
+    """
+    Current crowd aggregates for one route: at most one row per active
+    vehicle plus one row per minute of the last hour, never driver_status.
+    """
+    now = now or datetime.now(timezone.utc)
+
+    active, mean_ratio = (
+        db.query(func.count(RouteVehicle.driver_id), func.avg(RouteVehicle.occupancy_ratio))
+        .filter(
+            RouteVehicle.route_code == route_code,
+            RouteVehicle.reported_at >= now - ACTIVE_WINDOW,
+        )
+        .one()
+    )
+    buckets = (
+        db.query(RouteCrowdBucket)
+        .filter(
+            RouteCrowdBucket.route_code == route_code,
+            RouteCrowdBucket.bucket_start > now - MAX_WINDOW - BUCKET,
+        )
+        .all()
+    )
+    return {
+        "route_code": route_code,
+        "active_vehicles": active,
+        "mean_occupancy_ratio": round(mean_ratio, 3) if active else None,
+        "crowd_levels": summarize_buckets(buckets, now),
+    }
@@ -1,31 +1,92 @@
 import json
 import os
 
+GEOJSON_PATH = os.path.join(os.path.dirname(__file__), "data", "jeepney_route.geojson")
+
 # Global variable to cache the GeoJSON data
 GEOJSON_DATA = None
 
-def load_geojson():
-    global GEOJSON_DATA
-    file_path = os.path.join(os.path.dirname(__file__), "data", "jeepney_route.geojson")
+# Lookup of normalized route ref -> geometry, built once when the GeoJSON is loaded
+ROUTE_GEOMETRY_INDEX = {}
+
+
+def clean_route_code(value) -> str:
+    """
+    Route code as text, keeping its original case.
+    Spreadsheet codes may come back as numbers (101 or 101.0), so those are
+    turned into their plain integer text.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def route_key(value) -> str:
+    """
+    Normalize a route code / GeoJSON 'ref' into a case-insensitive lookup key.
+    """
+    return clean_route_code(value).lower()
+
+
+def iter_route_features(geojson_data):
+    """
+    Yield (lookup key, ref as written, geometry) for every feature with a 'ref'.
+    """
+    for feature in (geojson_data or {}).get("features", []):
+        props = feature.get("properties") or {}
+        ref = clean_route_code(props.get("ref"))
+        if ref:
+            yield ref.lower(), ref, feature.get("geometry")
+
+
+def build_route_index(geojson_data) -> dict:
+    """
+    Map each feature's 'ref' to its geometry.
+    The first feature wins when a ref appears more than once, which matches
+    the old linear scan in find_route_geometry.
+    """
+    index = {}
+    for key, _, geometry in iter_route_features(geojson_data):
+        index.setdefault(key, geometry)
+    return index
+
+
+def build_route_refs(geojson_data) -> dict:
+    """
+    Map each lookup key to the 'ref' as written in the GeoJSON (first one wins).
+    """
+    refs = {}
+    for key, ref, _ in iter_route_features(geojson_data):
+        refs.setdefault(key, ref)
+    return refs
+
+
+def read_geojson(file_path: str = GEOJSON_PATH):
+    """
+    Read a GeoJSON file without touching the module-level cache.
+    Raises FileNotFoundError if the file does not exist.
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_geojson(file_path: str = GEOJSON_PATH):
+    global GEOJSON_DATA, ROUTE_GEOMETRY_INDEX
     if os.path.exists(file_path):
-        with open(file_path, "r", encoding="utf-8") as f:
-            GEOJSON_DATA = json.load(f)
-            print("GeoJSON data loaded successfully.")
+        GEOJSON_DATA = read_geojson(file_path)
+        ROUTE_GEOMETRY_INDEX = build_route_index(GEOJSON_DATA)
+        print("GeoJSON data loaded successfully.")
     else:
         print("Warning: jeepney_route.geojson not found.")
 
 def find_route_geometry(route_code: str):
     if not GEOJSON_DATA:
         load_geojson()
-    
+
     if not GEOJSON_DATA:
         return None
 
-    # Search for the feature with matching 'ref' (route code)
-    # Note: Adjust 'ref' if your route_code matches a different property like 'name'
-    for feature in GEOJSON_DATA.get("features", []):
-        props = feature.get("properties", {})
-        # Check if route_code matches 'ref' or is part of 'name'
-        if str(props.get("ref", "")).lower() == route_code.lower():
-             return feature.get("geometry")
-    return None
+    # Features are keyed by their 'ref' (route code), see build_route_index
+    return ROUTE_GEOMETRY_INDEX.get(route_key(route_code))
@@ -0,0 +1,292 @@
+"""
+Bulk import of jeepney routes into the `routes` table.
+
+Reads the "METRO MANILA JEEPNEY ROUTES.xlsx" sheet (Route Code | Route) and
+upserts every row in batches with INSERT ... ON CONFLICT (route_code).
+Rows whose name/origin/destination/via did not change are skipped by the
+database, so re-running the import is idempotent and only touches real changes.
+
+At the same time the GeoJSON route refs are indexed, and any codes that exist
+only in the spreadsheet or only in the GeoJSON are reported, along with rows
+that have no route code or a name that does not split into origin/destination.
+
+Usage (from the backend folder):
+    python import_routes.py
+    python import_routes.py --xlsx "../METRO MANILA JEEPNEY ROUTES.xlsx" --dry-run
+
+Requires openpyxl (pip install openpyxl).
+"""
+import argparse
+import os
+import re
+
+from openpyxl import load_workbook
+from sqlalchemy import literal_column, or_
+from sqlalchemy.dialects.postgresql import insert
+
+from database import SessionLocal
+from models import Route
+from geojson_utils import GEOJSON_PATH, build_route_refs, clean_route_code, read_geojson, route_key
+
+XLSX_PATH = os.path.join(os.path.dirname(__file__), "..", "METRO MANILA JEEPNEY ROUTES.xlsx")
+BATCH_SIZE = 500
+
+# A parenthetical at the very end of the name: "(via Zapote)", "(Pasig)",
+# "(Parang - Stop & Shop via Aurora Blvd)"
+TRAILING_PAREN_RE = re.compile(r"\s*\(([^()]*)\)\s*$")
+# "A-B via C", "A-B via. C"
+VIA_RE = re.compile(r"\s+via\b\.?\s*(.*)$", re.IGNORECASE)
+DASH_RE = re.compile(r"[-–]")
+
+
+class RouteNameError(ValueError):
+    """Raised when a route name cannot be split into origin and destination."""
+
+
+def _is_word_hyphen(name: str, pos: int) -> bool:
+    """
+    True for hyphens inside a reduplicated place name such as "Balic-Balic",
+    "Dagat-Dagatan" or "Lapu-Lapu", which are not origin/destination separators.
+    """
+    if name[pos] != "-":
+        return False
+    left = re.search(r"(\w+)$", name[:pos])
+    right = re.match(r"(\w+)", name[pos + 1:])
+    if not left or not right:
+        return False
+    return right.group(1).lower().startswith(left.group(1).lower())
+
+
+def split_route_name(route_name: str):
+    """
+    Turn a route name into (origin, destination, via).
+
+    A trailing parenthetical is taken off first: "(via X)" becomes the via,
+    a short qualifier like "(Pasig)" stays on the destination, and longer
+    notes ("(A-B via C)") are left out of origin/destination.
+    Names without a dash (loop routes) use the name for both ends.
+    Raises RouteNameError when the separator is ambiguous, e.g. "Lian - Tuy - Balayan".
+    """
+    name = route_name.strip()
+    via = None
+    qualifier = None
+
+    m = TRAILING_PAREN_RE.search(name)
+    if m and m.start() > 0:
+        note = m.group(1).strip()
+        name = name[:m.start()].strip()
+        via_note = re.match(r"via\b\.?\s*(.*)$", note, re.IGNORECASE)
+        if via_note:
+            via = via_note.group(1).strip() or None
+        elif not DASH_RE.search(note) and not re.search(r"\bvia\b", note, re.IGNORECASE):
+            qualifier = f"({note})"
+
+    m = VIA_RE.search(name)
+    if m and m.start() > 0:
+        inline_via = m.group(1).strip() or None
+        if via and inline_via:
+            via = f"{inline_via}, {via}"
+        else:
+            via = via or inline_via
+        name = name[:m.start()].strip()
+
+    seps = [d.start() for d in DASH_RE.finditer(name) if not _is_word_hyphen(name, d.start())]
+    # An en dash or a dash with spaces on both sides is an explicit separator
+    strong = [
+        i for i in seps
+        if name[i] == "–" or (0 < i < len(name) - 1 and name[i - 1].isspace() and name[i + 1].isspace())
+    ]
+    if len(strong) == 1:
+        seps = strong
+    elif len(strong) > 1:
+        raise RouteNameError(f"ambiguous separator in {route_name!r}")
+
+    if not seps:
+        if DASH_RE.search(name):
+            # Only word hyphens, e.g. "Libertad, Pasay-Pasay Rd." -- can't tell the ends apart
+            raise RouteNameError(f"no clear separator in {route_name!r}")
+        origin = destination = name
+    elif len(seps) == 1:
+        origin, destination = name[:seps[0]].strip(), name[seps[0] + 1:].strip()
+        if not origin or not destination:
+            raise RouteNameError(f"empty origin or destination in {route_name!r}")
+    else:
+        raise RouteNameError(f"ambiguous separator in {route_name!r}")
+
+    if qualifier:
+        if seps:
+            destination = f"{destination} {qualifier}"
+        else:
+            origin = destination = f"{name} {qualifier}"
+
+    return origin, destination, via
+
+
+def iter_spreadsheet_routes(xlsx_path: str):
+    """
+    Stream (route_code, route_name) rows from the spreadsheet.
+    Uses openpyxl's read-only mode so the workbook is never fully loaded.
+    route_code is "" for rows with a blank Route Code.
+    """
+    wb = load_workbook(xlsx_path, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        rows = ws.iter_rows(values_only=True)
+        next(rows, None)  # header: Route Code | Route
+        for row in rows:
+            if not row or len(row) < 2 or not row[1]:
+                continue
+            yield clean_route_code(row[0]), str(row[1]).strip()
+    finally:
+        wb.close()
+
+
+def upsert_batch(db, batch: list) -> dict:
+    """
+    Upsert one batch of route dicts and return how many were inserted/updated.
+    The WHERE clause keeps unchanged rows out of the UPDATE entirely.
+    """
+    stmt = insert(Route).values(batch)
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Route.route_code],
+        set_={
+            "route_name": excluded.route_name,
+            "origin": excluded.origin,
+            "destination": excluded.destination,
+            "via": excluded.via,
+        },
+        where=or_(
+            Route.route_name.is_distinct_from(excluded.route_name),
+            Route.origin.is_distinct_from(excluded.origin),
+            Route.destination.is_distinct_from(excluded.destination),
+            Route.via.is_distinct_from(excluded.via),
+        ),
+    ).returning(Route.route_code, literal_column("(xmax = 0)").label("inserted"))
+
+    counts = {"inserted": 0, "updated": 0}
+    for _, inserted in db.execute(stmt):
+        counts["inserted" if inserted else "updated"] += 1
+    return counts
+
+
+def import_routes(xlsx_path: str = XLSX_PATH, geojson_path: str = GEOJSON_PATH,
+                  batch_size: int = BATCH_SIZE, dry_run: bool = False) -> dict:
+    if not os.path.exists(geojson_path):
+        raise FileNotFoundError(f"GeoJSON file not found: {geojson_path}")
+    # Read into a local value; the API's cached GeoJSON in geojson_utils is left alone
+    geo_refs = build_route_refs(read_geojson(geojson_path))  # lookup key -> ref as written
+
+    seen = set()
+    duplicates = []
+    missing_code = []
+    unparsed = []
+    missing_geometry = []
+    counts = {"read": 0, "inserted": 0, "updated": 0}
+
+    db = SessionLocal()
+    try:
+        batch = []
+        for code, name in iter_spreadsheet_routes(xlsx_path):
+            counts["read"] += 1
+            if not code:
+                missing_code.append(name)
+                continue
+            key = route_key(code)
+
+            # One ON CONFLICT statement cannot touch the same row twice,
+            # so only the first occurrence of a code is imported.
+            if key in seen:
+                duplicates.append((code, name))
+                continue
+            seen.add(key)
+
+            if key not in geo_refs:
+                missing_geometry.append(code)
+
+            try:
+                origin, destination, via = split_route_name(name)
+            except RouteNameError:
+                unparsed.append((code, name))
+                continue
+            batch.append({
+                "route_code": code,
+                "route_name": name,
+                "origin": origin,
+                "destination": destination,
+                "via": via,
+            })
+
+            if len(batch) >= batch_size:
+                if not dry_run:
+                    for k, v in upsert_batch(db, batch).items():
+                        counts[k] += v
+                batch = []
+
+        if batch and not dry_run:
+            for k, v in upsert_batch(db, batch).items():
+                counts[k] += v
+
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    imported = len(seen) - len(unparsed)
+    counts["unchanged"] = 0 if dry_run else imported - counts["inserted"] - counts["updated"]
+    return {
+        "counts": counts,
+        "duplicates": duplicates,
+        "missing_code": missing_code,
+        "unparsed": unparsed,
+        "missing_geometry": sorted(missing_geometry),
+        "missing_in_spreadsheet": sorted(ref for key, ref in geo_refs.items() if key not in seen),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import jeepney routes from the spreadsheet + GeoJSON")
+    parser.add_argument("--xlsx", default=XLSX_PATH, help="path to the routes spreadsheet")
+    parser.add_argument("--geojson", default=GEOJSON_PATH, help="path to jeepney_route.geojson")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="parse and reconcile only, no DB writes")
+    args = parser.parse_args()
+
+    try:
+        report = import_routes(args.xlsx, args.geojson, args.batch_size, args.dry_run)
+    except FileNotFoundError as e:
+        parser.exit(1, f"Error: {e}\n")
+    counts = report["counts"]
+
+    print(
+        f"Read {counts['read']} rows: {counts['inserted']} inserted, "
+        f"{counts['updated']} updated, {counts['unchanged']} unchanged"
+        + (" (dry run)" if args.dry_run else "")
+    )
+    if report["duplicates"]:
+        print(f"Skipped {len(report['duplicates'])} duplicate route codes:")
+        for code, name in report["duplicates"]:
+            print(f"  {code}: {name}")
+    if report["missing_code"]:
+        print(f"Skipped {len(report['missing_code'])} rows with no route code:")
+        for name in report["missing_code"]:
+            print(f"  {name}")
+    if report["unparsed"]:
+        print(f"Skipped {len(report['unparsed'])} routes whose origin/destination could not be parsed:")
+        for code, name in report["unparsed"]:
+            print(f"  {code}: {name}")
+    if report["missing_geometry"]:
+        print(f"{len(report['missing_geometry'])} route codes have no GeoJSON geometry:")
+        print("  " + ", ".join(report["missing_geometry"]))
+    if report["missing_in_spreadsheet"]:
+        print(f"{len(report['missing_in_spreadsheet'])} GeoJSON refs are not in the spreadsheet:")
+        print("  " + ", ".join(report["missing_in_spreadsheet"]))
+
+
+if __name__ == "__main__":
+    main()
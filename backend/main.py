@@ -1,9 +1,11 @@
 import bcrypt
-from fastapi import FastAPI, Depends, HTTPException, File, UploadFile
+from fastapi import FastAPI, Depends, HTTPException, File, UploadFile, Request, Response, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 from datetime import datetime, timezone
+from typing import Optional, Literal
 import io
 from PIL import Image
 from ultralytics import YOLO
@@ -11,13 +13,17 @@ from ultralytics import YOLO
 from database import get_db
 from models import Driver, Route, DriverRoute, DriverStatus
 from geojson_utils import find_route_geometry, load_geojson
+from route_catalog import catalog, etag_matches, parse_fields
+from crowd_stats import record_status, route_crowd
+from status_export import iter_status_rows, iter_csv, iter_ndjson
 from schemas import (
     DriverCreate, DriverOut,
-    RouteOut,
+    RouteOut, RoutePage,
     DriverRouteAssign,
     DriverStatusCreate, DriverStatusOut,
     DriverLogin,
     DriverCrowdUpdate,
+    RouteCrowdOut,
 )
 
 # Load GeoJSON on startup (or first request)
@@ -104,6 +110,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def get_active_route_code(db: Session, driver_id: int) -> Optional[str]:
+    """
+    Route code of the driver's latest route assignment, if any.
+    """
+    active_assignment = (
+        db.query(DriverRoute)
+        .filter(DriverRoute.driver_id == driver_id)
+        .order_by(desc(DriverRoute.assigned_at))
+        .first()
+    )
+    if not active_assignment:
+        return None
+    # We need the route_code from the route_id
+    route = db.query(Route).filter(Route.id == active_assignment.route_id).first()
+    return route.route_code if route else None
+
 def hash_password(password: str) -> str:
     # bcrypt expects bytes, so we encode the password
     salt = bcrypt.gensalt()
@@ -160,19 +182,10 @@ async def detect_passengers(
     )
     
     # Optional: fetch active route to link this status
-    active_assignment = (
-        db.query(DriverRoute)
-        .filter(DriverRoute.driver_id == driver_id)
-        .order_by(desc(DriverRoute.assigned_at))
-        .first()
-    )
-    if active_assignment:
-        # We need the route_code from the route_id
-        route = db.query(Route).filter(Route.id == active_assignment.route_id).first()
-        if route:
-            status_entry.route_code = route.route_code
+    status_entry.route_code = get_active_route_code(db, driver_id)
 
     db.add(status_entry)
+    record_status(db, status_entry, driver.max_passenger_count)
     db.commit()
     db.refresh(status_entry)
     
@@ -185,14 +198,34 @@ async def detect_passengers(
 
 
 @app.get("/routes", response_model=list[RouteOut])
-def get_routes(db: Session = Depends(get_db)):
-    routes = (
-        db.query(Route)
-        .filter(Route.is_active == True)
-        .order_by(Route.route_code)
-        .all()
-    )
-    return routes
+def get_routes(request: Request, db: Session = Depends(get_db)):
+    # Served from the in-process catalog as pre-serialized JSON.
+    # "no-cache" makes the browser revalidate with If-None-Match every time,
+    # which is answered with an empty 304 while the catalog is unchanged.
+    snap = catalog.get(db)
+    headers = {"ETag": snap.etag, "Cache-Control": "no-cache"}
+
+    if etag_matches(request.headers.get("if-none-match", ""), snap.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=snap.body, media_type="application/json", headers=headers)
+
+
+@app.get("/routes/search", response_model=RoutePage)
+def search_routes(
+    q: Optional[str] = Query(default=None, description="route_code or route_name prefix"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    limit: int = Query(default=50, ge=1, le=500),
+    fields: Optional[str] = Query(default=None, description="comma-separated RouteOut fields"),
+    db: Session = Depends(get_db),
+):
+    try:
+        field_list = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    items, next_cursor = catalog.get(db).page(q, cursor, limit, field_list)
+    return {"items": items, "next_cursor": next_cursor}
 
 @app.post("/drivers", response_model=DriverOut, status_code=201)
 def create_driver(payload: DriverCreate, db: Session = Depends(get_db)):
@@ -296,6 +329,16 @@ def get_route_geometry(route_code: str):
     return geometry
 
 
+@app.get("/routes/{route_code}/crowd", response_model=RouteCrowdOut)
+def get_route_crowd(route_code: str, db: Session = Depends(get_db)):
+    # Served from the route_vehicles / route_crowd_buckets aggregates kept up
+    # to date on each status write, so this never scans driver_status.
+    route = db.query(Route).filter(Route.route_code == route_code).first()
+    if not route:
+        raise HTTPException(status_code=404, detail="Route not found")
+    return route_crowd(db, route_code)
+
+
 @app.post("/driver-status", response_model=DriverStatusOut, status_code=201)
 def create_driver_status(payload: DriverStatusCreate, db: Session = Depends(get_db)):
     driver = db.query(Driver).filter(Driver.id == payload.driver_id).first()
@@ -317,6 +360,7 @@ def create_driver_status(payload: DriverStatusCreate, db: Session = Depends(get_
 
     s = DriverStatus(**payload.model_dump())
     db.add(s)
+    record_status(db, s, driver.max_passenger_count)
     db.commit()
     db.refresh(s)
     return s
@@ -334,6 +378,25 @@ def latest_status(driver_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="No status yet for this driver")
     return s
 
+@app.get("/driver-status/export")
+def export_driver_status(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    driver_id: Optional[int] = None,
+    route_code: Optional[str] = None,
+    export_format: Literal["ndjson", "csv"] = Query(default="ndjson", alias="format"),
+):
+    rows = iter_status_rows(start, end, driver_id, route_code)
+
+    if export_format == "csv":
+        return StreamingResponse(
+            iter_csv(rows),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="driver_status.csv"'},
+        )
+    return StreamingResponse(iter_ndjson(rows), media_type="application/x-ndjson")
+
+
 @app.post("/cv/crowd")
 def update_crowd(payload: DriverCrowdUpdate, db: Session = Depends(get_db)):
     # Ensure driver exists
@@ -353,10 +416,12 @@ def update_crowd(payload: DriverCrowdUpdate, db: Session = Depends(get_db)):
     # Insert a new status row (keeps history)
     status = DriverStatus(
         driver_id=payload.driver_id,
+        route_code=get_active_route_code(db, payload.driver_id),
         current_passenger_count=payload.current_passenger_count,
         crowd_level=payload.crowd_level,
         reported_at=now,
     )
     db.add(status)
+    record_status(db, status, driver.max_passenger_count)
     db.commit()
     return {"ok": True, "driver_id": payload.driver_id}
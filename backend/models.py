@@ -62,3 +62,27 @@ class DriverStatus(Base):
     current_passenger_count = Column(Integer, nullable=False, server_default="0")
 
     reported_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+
+# Per-route crowd aggregates, kept up to date by crowd_stats.record_status in
+# the same transaction as each driver_status insert.
+class RouteCrowdBucket(Base):
+    __tablename__ = "route_crowd_buckets"
+
+    route_code = Column(Text, ForeignKey("routes.route_code", ondelete="CASCADE"), primary_key=True)
+    bucket_start = Column(TIMESTAMP(timezone=True), primary_key=True)  # start of the minute
+
+    spacious = Column(Integer, nullable=False, server_default="0")
+    crowded = Column(Integer, nullable=False, server_default="0")
+    full = Column(Integer, nullable=False, server_default="0")
+    unknown = Column(Integer, nullable=False, server_default="0")
+
+
+class RouteVehicle(Base):
+    __tablename__ = "route_vehicles"
+
+    # Latest report per driver, used for active vehicles / mean occupancy
+    driver_id = Column(BigInteger, ForeignKey("drivers.id", ondelete="CASCADE"), primary_key=True)
+    route_code = Column(Text, ForeignKey("routes.route_code", ondelete="CASCADE"), nullable=False, index=True)
+    occupancy_ratio = Column(Float, nullable=False)
+    reported_at = Column(TIMESTAMP(timezone=True), nullable=False)
@@ -0,0 +1,178 @@
+import bisect
+import hashlib
+import json
+import threading
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from models import Route
+from schemas import RouteOut
+
+# How often a warm catalog re-checks the routes table version, so changes
+# made by another process (e.g. import_routes.py) show up without a restart.
+CATALOG_CHECK_SEC = 5
+
+# Fingerprint of the routes table contents. It changes with every committed
+# insert/update/delete, whatever order the transactions commit in. It reads the
+# whole table, which is only a few hundred rows, at most once per CATALOG_CHECK_SEC.
+ROUTES_VERSION_SQL = text(
+    "SELECT md5(coalesce(string_agg(r::text, ',' ORDER BY r.id), '')) FROM routes r"
+)
+
+ROUTE_FIELDS = tuple(RouteOut.model_fields)
+
+
+class CatalogSnapshot:
+    """
+    One build of the active route list: rows as plain dicts (sorted
+    by route_code) plus the JSON bytes and ETag of the full list.
+    """
+
+    def __init__(self, rows: list, version=None):
+        # Sort in Python so the cursor comparison in page() matches the order
+        # exactly, whatever collation the database uses.
+        self.rows = sorted(rows, key=lambda r: r["route_code"])
+        self.codes = [r["route_code"] for r in self.rows]
+        self.body = json.dumps(self.rows, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest() + '"'
+        self.version = version
+        self.checked_at = time.monotonic()
+
+    def page(self, prefix: str = None, cursor: str = None, limit: int = 50, fields: list = None):
+        """
+        Return (items, next_cursor) for rows whose route_code or route_name
+        starts with `prefix`, after the `cursor` route_code.
+        Rows are already ordered by route_code, so the cursor is just the last
+        route_code of the previous page and bisect finds where to resume.
+        """
+        needle = prefix.strip().lower() if prefix else None
+        items = []
+        next_cursor = None
+
+        start = bisect.bisect_right(self.codes, cursor) if cursor is not None else 0
+        for row in self.rows[start:]:
+            if needle and not (
+                row["route_code"].lower().startswith(needle)
+                or row["route_name"].lower().startswith(needle)
+            ):
+                continue
+            if len(items) == limit:
+                next_cursor = items[-1]["route_code"]
+                break
+            items.append(row)
+
+        if fields:
+            items = [{f: row[f] for f in fields} for row in items]
+        return items, next_cursor
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    If-None-Match check using weak comparison: "*" matches anything, and a
+    W/ prefix (added by e.g. gzip proxies) is ignored.
+    """
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == opaque:
+            return True
+    return False
+
+
+def parse_fields(fields: str):
+    """
+    Turn ?fields=a,b into a list of RouteOut fields, always including route_code
+    (it is the paging cursor). Returns None when no fields were asked for.
+    Raises ValueError naming any unknown fields.
+    """
+    if not fields:
+        return None
+    field_list = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in field_list if f not in ROUTE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    if "route_code" not in field_list:
+        field_list.insert(0, "route_code")
+    return field_list
+
+
+class RouteCatalog:
+    """
+    In-process cache of the active route list.
+    GET /routes never touches Pydantic while the cache is warm, and hits the
+    DB at most once per CATALOG_CHECK_SEC for a one-row version probe.
+    """
+
+    def __init__(self, check_interval: float = CATALOG_CHECK_SEC):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+
+    def _recently_checked(self):
+        snap = self._snapshot
+        if snap is not None and (time.monotonic() - snap.checked_at) < self.check_interval:
+            return snap
+        return None
+
+    def get(self, db: Session) -> CatalogSnapshot:
+        snap = self._recently_checked()
+        if snap is not None:
+            return snap
+        with self._lock:
+            snap = self._recently_checked()
+            if snap is not None:
+                return snap
+
+            # Probe before loading, so a change made while loading is caught next time
+            version = tuple(db.execute(ROUTES_VERSION_SQL).one())
+            snap = self._snapshot
+            if snap is not None and snap.version == version:
+                snap.checked_at = time.monotonic()
+                return snap
+
+            routes = (
+                db.query(Route)
+                .filter(Route.is_active == True)
+                .order_by(Route.route_code)
+                .all()
+            )
+            snap = CatalogSnapshot([RouteOut.model_validate(r).model_dump() for r in routes], version)
+            self._snapshot = snap
+        return snap
+
+
+catalog = RouteCatalog()
+
+
+# -------------------------
+# Invalidation on route changes made through the ORM
+# -------------------------
+@event.listens_for(Session, "after_flush")
+def _mark_routes_changed(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Route):
+            session.info["routes_changed"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    if session.info.pop("routes_changed", False):
+        catalog.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_on_rollback(session):
+    session.info.pop("routes_changed", None)
@@ -52,6 +52,12 @@ class RouteOut(BaseModel):
         from_attributes = True
 
 
+class RoutePage(BaseModel):
+    # items may be trimmed to the requested ?fields=, so they stay plain dicts
+    items: list[dict]
+    next_cursor: Optional[str] = None
+
+
 class DriverRouteAssign(BaseModel):
     driver_id: int
     route_code: str
@@ -85,3 +91,11 @@ class DriverCrowdUpdate(BaseModel):
     driver_id: int
     current_passenger_count: int = Field(ge=0)
     crowd_level: CrowdLevel
+
+
+class RouteCrowdOut(BaseModel):
+    route_code: str
+    active_vehicles: int
+    mean_occupancy_ratio: Optional[float]
+    # window label ("5m", "1h") -> crowd_level -> number of reports
+    crowd_levels: dict[str, dict[str, int]]
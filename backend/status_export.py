@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+
+from database import SessionLocal
+from models import DriverStatus
+
+EXPORT_COLUMNS = [
+    "id", "driver_id", "route_code", "direction", "latitude", "longitude",
+    "crowd_level", "current_passenger_count", "reported_at",
+]
+EXPORT_BATCH_SIZE = 1000
+
+# Flush the CSV buffer to the client once it reaches this size
+CSV_CHUNK_SIZE = 64 * 1024
+
+
+def status_export_row(s) -> dict:
+    row = {col: getattr(s, col) for col in EXPORT_COLUMNS}
+    # Same ISO-8601 format the Pydantic responses use
+    row["reported_at"] = s.reported_at.isoformat()
+    return row
+
+
+def iter_status_rows(start, end, driver_id, route_code):
+    """
+    Yield DriverStatus rows through a server-side cursor, EXPORT_BATCH_SIZE at a time.
+    Uses its own session because the response body is streamed after the
+    request's get_db() session may already be closed.
+    """
+    db = SessionLocal()
+    try:
+        q = db.query(DriverStatus)
+        if start:
+            q = q.filter(DriverStatus.reported_at >= start)
+        if end:
+            q = q.filter(DriverStatus.reported_at < end)
+        if driver_id is not None:
+            q = q.filter(DriverStatus.driver_id == driver_id)
+        if route_code:
+            q = q.filter(DriverStatus.route_code == route_code)
+        q = (
+            q.order_by(DriverStatus.reported_at, DriverStatus.id)
+            .execution_options(stream_results=True)
+            .yield_per(EXPORT_BATCH_SIZE)
+        )
+        for s in q:
+            yield status_export_row(s)
+            db.expunge(s)
+    finally:
+        db.close()
+
+
+def iter_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row) + "\n"
+
+
+def iter_csv(rows):
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        if buf.tell() >= CSV_CHUNK_SIZE:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
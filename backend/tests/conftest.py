@@ -0,0 +1,46 @@
+import os
+import sys
+
+# The backend modules import each other as top-level modules (from models import ...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeQuery:
+    """Stand-in for a SQLAlchemy Query: chaining returns itself, all()/one() return the rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def join(self, *args):
+        return self
+
+    def filter(self, *args):
+        return self
+
+    def order_by(self, *args):
+        return self
+
+    def all(self):
+        return self.rows
+
+    def one(self):
+        return self.rows[0]
+
+
+class FakeDB:
+    """
+    Minimal Session stand-in: query() returns `rows`, execute() returns `version`.
+    `queries` counts query() calls so tests can tell when data was reloaded.
+    """
+
+    def __init__(self, rows=(), version=None):
+        self.rows = list(rows)
+        self.version = version
+        self.queries = 0
+
+    def execute(self, stmt):
+        return FakeQuery([self.version])
+
+    def query(self, *args):
+        self.queries += 1
+        return FakeQuery(self.rows)
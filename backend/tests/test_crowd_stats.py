@@ -0,0 +1,88 @@
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from crowd_stats import bucket_start, crowd_level_column, record_status, summarize_buckets
+
+NOW = datetime(2026, 10, 19, 8, 30, 20, tzinfo=timezone.utc)
+
+
+def bucket(minutes_ago, **counts):
+    start = bucket_start(NOW) - timedelta(minutes=minutes_ago)
+    levels = {"spacious": 0, "crowded": 0, "full": 0, "unknown": 0, **counts}
+    return SimpleNamespace(bucket_start=start, **levels)
+
+
+def test_bucket_start_truncates_to_minute():
+    assert bucket_start(NOW) == datetime(2026, 10, 19, 8, 30, tzinfo=timezone.utc)
+
+
+def test_crowd_level_column():
+    assert crowd_level_column("full") == "full"
+    assert crowd_level_column(None) == "unknown"
+    assert crowd_level_column("packed") == "unknown"
+
+
+def test_summarize_buckets_windows():
+    buckets = [
+        bucket(0, full=2),
+        bucket(5, crowded=1),   # overlaps the 5m window by its last 20 seconds
+        bucket(6, spacious=4),  # entirely before the 5m window
+        bucket(60, crowded=3),  # overlaps the 1h window
+        bucket(61, full=7),     # too old for either window
+    ]
+    result = summarize_buckets(buckets, NOW)
+    assert result["5m"] == {"full": 2, "crowded": 1}
+    assert result["1h"] == {"full": 2, "crowded": 4, "spacious": 4}
+
+
+def test_summarize_buckets_empty():
+    assert summarize_buckets([], NOW) == {"5m": {}, "1h": {}}
+
+
+class FakeSession:
+    def __init__(self, fail_on_execute=False, fail_on_flush=False):
+        self.fail_on_execute = fail_on_execute
+        self.fail_on_flush = fail_on_flush
+        self.statements = []
+
+    def flush(self):
+        if self.fail_on_flush:
+            raise RuntimeError("status insert failed")
+
+    def begin_nested(self):
+        return nullcontext()
+
+    def execute(self, stmt):
+        if self.fail_on_execute:
+            raise RuntimeError("aggregate table missing")
+        self.statements.append(stmt)
+
+    def query(self, *args):
+        return SimpleNamespace(filter=lambda *a: SimpleNamespace(delete=lambda **kw: 0))
+
+
+def make_status(route_code="T101"):
+    return SimpleNamespace(
+        driver_id=1, route_code=route_code, crowd_level="crowded",
+        current_passenger_count=9, reported_at=NOW,
+    )
+
+
+def test_record_status_upserts_bucket_and_vehicle():
+    db = FakeSession()
+    record_status(db, make_status(), 18)
+    tables = [stmt.table.name for stmt in db.statements]
+    assert tables == ["route_crowd_buckets", "route_vehicles"]
+
+
+def test_record_status_failure_does_not_break_the_write(capsys):
+    record_status(FakeSession(fail_on_execute=True), make_status(), 18)
+    assert "Failed to update crowd aggregates" in capsys.readouterr().out
+
+
+def test_record_status_surfaces_status_insert_errors():
+    with pytest.raises(RuntimeError, match="status insert failed"):
+        record_status(FakeSession(fail_on_flush=True), make_status(), 18)
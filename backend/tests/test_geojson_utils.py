@@ -0,0 +1,43 @@
+import geojson_utils
+from geojson_utils import build_route_index, clean_route_code, route_key
+
+
+def test_clean_route_code_keeps_case_and_strips():
+    assert clean_route_code("  T221a ") == "T221a"
+
+
+def test_clean_route_code_numeric_cells():
+    assert clean_route_code(101) == "101"
+    assert clean_route_code(101.0) == "101"
+    assert clean_route_code(None) == ""
+
+
+def test_route_key_is_case_insensitive():
+    assert route_key("T221a") == route_key("t221A") == "t221a"
+    assert route_key(101.0) == route_key("101")
+
+
+def test_build_route_index_first_feature_wins():
+    data = {"features": [
+        {"properties": {"ref": "T101"}, "geometry": {"id": 1}},
+        {"properties": {"ref": "t101"}, "geometry": {"id": 2}},
+        {"properties": {}, "geometry": {"id": 3}},
+    ]}
+    assert build_route_index(data) == {"t101": {"id": 1}}
+
+
+def test_find_route_geometry_uses_index(monkeypatch):
+    data = {"features": [{"properties": {"ref": "T221a"}, "geometry": {"id": 1}}]}
+    monkeypatch.setattr(geojson_utils, "GEOJSON_DATA", data)
+    monkeypatch.setattr(geojson_utils, "ROUTE_GEOMETRY_INDEX", build_route_index(data))
+    assert geojson_utils.find_route_geometry("t221A") == {"id": 1}
+    assert geojson_utils.find_route_geometry("T999") is None
+
+
+def test_build_route_refs_keeps_ref_as_written():
+    data = {"features": [
+        {"properties": {"ref": "T221a"}, "geometry": None},
+        {"properties": {"ref": "t221A"}, "geometry": None},
+        {"properties": {"ref": 101.0}, "geometry": None},
+    ]}
+    assert geojson_utils.build_route_refs(data) == {"t221a": "T221a", "101": "101"}
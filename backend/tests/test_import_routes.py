@@ -0,0 +1,90 @@
+import pytest
+
+from import_routes import RouteNameError, split_route_name
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Novaliches-Malinta via Paso de Blas", ("Novaliches", "Malinta", "Paso de Blas")),
+    ("Alabang-Baclaran (via Zapote)", ("Alabang", "Baclaran", "Zapote")),
+    ("Quezon Ave.–LRT 5th Ave., Caloocan City", ("Quezon Ave.", "LRT 5th Ave., Caloocan City", None)),
+    ("Bagumbayan (Taguig)-Pasig (TP) via San Joaquin", ("Bagumbayan (Taguig)", "Pasig (TP)", "San Joaquin")),
+    ("Camella Gawara -Lozada Market", ("Camella Gawara", "Lozada Market", None)),
+    ("QMC Loop", ("QMC Loop", "QMC Loop", None)),
+])
+def test_split_route_name(name, expected):
+    assert split_route_name(name) == expected
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Balic-Balic-Quiapo (Barbosa) via Lepanto", ("Balic-Balic", "Quiapo (Barbosa)", "Lepanto")),
+    ("Dagat-Dagatan-Divisoria Ilaya via Lapu-Lapu Ave", ("Dagat-Dagatan", "Divisoria Ilaya", "Lapu-Lapu Ave")),
+])
+def test_split_route_name_keeps_hyphenated_places(name, expected):
+    assert split_route_name(name) == expected
+
+
+def test_split_route_name_qualifier_stays_on_destination():
+    assert split_route_name("Cubao-Sta. Lucia (Pasig)") == ("Cubao", "Sta. Lucia (Pasig)", None)
+
+
+@pytest.mark.parametrize("name, expected", [
+    (
+        "Litex-Rodriguez Relocation (Rodriguez Relocation-Commonwealth Market via Gravel Pit)",
+        ("Litex", "Rodriguez Relocation", None),
+    ),
+    ("Parang – Cubao (Parang - Stop & Shop via Aurora Blvd)", ("Parang", "Cubao", None)),
+])
+def test_split_route_name_drops_trailing_notes(name, expected):
+    assert split_route_name(name) == expected
+
+
+@pytest.mark.parametrize("name", [
+    "Lian - Tuy - Balayan",
+    "Libertad, Pasay-Pasay Rd.",
+    "Alabang-",
+])
+def test_split_route_name_rejects_ambiguous_names(name):
+    with pytest.raises(RouteNameError):
+        split_route_name(name)
+
+
+def test_import_routes_dry_run_report(tmp_path):
+    from openpyxl import Workbook
+    from import_routes import import_routes
+    import json
+
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Route Code", "Route"])
+    ws.append([101, "Novaliches-Malinta via Paso de Blas"])
+    ws.append(["T221a", "Forbes Park - Pasay Road via Ayala C."])
+    ws.append([101, "Novaliches-Blumentritt"])
+    ws.append([None, "UP Ikot"])
+    ws.append(["T999", "Lian - Tuy - Balayan"])
+    xlsx = tmp_path / "routes.xlsx"
+    wb.save(xlsx)
+
+    geojson = tmp_path / "routes.geojson"
+    geojson.write_text(json.dumps({"features": [
+        {"properties": {"ref": "t221A"}, "geometry": None},
+        {"properties": {"ref": "T500"}, "geometry": None},
+    ]}))
+
+    import geojson_utils
+    cached = geojson_utils.GEOJSON_DATA
+    report = import_routes(str(xlsx), str(geojson), dry_run=True)
+    assert geojson_utils.GEOJSON_DATA is cached
+
+    assert report["counts"]["read"] == 5
+    assert report["duplicates"] == [("101", "Novaliches-Blumentritt")]
+    assert report["missing_code"] == ["UP Ikot"]
+    assert report["unparsed"] == [("T999", "Lian - Tuy - Balayan")]
+    assert report["missing_geometry"] == ["101", "T999"]
+    assert report["missing_in_spreadsheet"] == ["T500"]
+
+
+def test_import_routes_requires_geojson(tmp_path):
+    from import_routes import import_routes
+
+    with pytest.raises(FileNotFoundError, match="missing.geojson"):
+        import_routes(str(tmp_path / "routes.xlsx"), str(tmp_path / "missing.geojson"), dry_run=True)
@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+from conftest import FakeDB
+from route_catalog import CatalogSnapshot, RouteCatalog, etag_matches, parse_fields
+
+
+def make_row(code, name):
+    return {
+        "id": len(code), "route_code": code, "route_name": name,
+        "origin": "A", "destination": "B", "via": None, "is_active": True,
+    }
+
+
+ROWS = [
+    make_row("T103", "Karuhatan-Ugong Valenzuela"),
+    make_row("T101", "Bagong Silang-Novaliches"),
+    make_row("T102", "Camarin-Novaliches"),
+    make_row("301", "Pandacan-L. Guinto"),
+]
+
+
+def test_body_is_sorted_and_etag_stable():
+    a = CatalogSnapshot(list(ROWS))
+    b = CatalogSnapshot(list(reversed(ROWS)))
+    codes = [r["route_code"] for r in json.loads(a.body)]
+    assert codes == ["301", "T101", "T102", "T103"]
+    assert a.body == b.body
+    assert a.etag == b.etag
+
+
+def test_page_cursor_at_exact_page_boundary():
+    snap = CatalogSnapshot(list(ROWS))
+    items, cursor = snap.page(limit=2)
+    assert [r["route_code"] for r in items] == ["301", "T101"]
+    assert cursor == "T101"
+
+    items, cursor = snap.page(cursor=cursor, limit=2)
+    assert [r["route_code"] for r in items] == ["T102", "T103"]
+    # Nothing after the last row, so no further page
+    assert cursor is None
+
+
+def test_page_prefix_matches_code_or_name():
+    snap = CatalogSnapshot(list(ROWS))
+    items, _ = snap.page(prefix="t10")
+    assert [r["route_code"] for r in items] == ["T101", "T102", "T103"]
+    items, _ = snap.page(prefix="camarin")
+    assert [r["route_code"] for r in items] == ["T102"]
+
+
+def test_page_fields():
+    snap = CatalogSnapshot(list(ROWS))
+    items, _ = snap.page(limit=1, fields=["route_code", "route_name"])
+    assert items == [{"route_code": "301", "route_name": "Pandacan-L. Guinto"}]
+
+
+class FakeRoute:
+    def __init__(self, row):
+        self.__dict__.update(row)
+
+
+def test_catalog_reloads_only_when_version_changes():
+    db = FakeDB([FakeRoute(r) for r in ROWS], version=("v1",))
+    catalog = RouteCatalog(check_interval=0)
+
+    first = catalog.get(db)
+    assert catalog.get(db) is first
+    assert db.queries == 1
+
+    db.version = ("v2",)  # e.g. import_routes.py committed from another process
+    assert catalog.get(db) is not first
+    assert db.queries == 2
+
+
+def test_page_cursor_between_codes():
+    snap = CatalogSnapshot(list(ROWS))
+    # A cursor that is not itself a route_code still resumes after it
+    items, cursor = snap.page(cursor="T101a", limit=5)
+    assert [r["route_code"] for r in items] == ["T102", "T103"]
+    assert cursor is None
+
+
+@pytest.mark.parametrize("header, matches", [
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"zzz", W/"abc"', True),
+    ("*", True),
+    ('"zzz"', False),
+    ("", False),
+])
+def test_etag_matches(header, matches):
+    # /routes answers 304 exactly when this returns True
+    assert etag_matches(header, '"abc"') is matches
+
+
+def test_parse_fields_always_includes_route_code():
+    assert parse_fields(None) is None
+    assert parse_fields("route_name, via") == ["route_code", "route_name", "via"]
+    assert parse_fields("via,route_code") == ["via", "route_code"]
+
+
+def test_parse_fields_rejects_unknown_fields():
+    # /routes/search turns this into a 422
+    with pytest.raises(ValueError, match="Unknown fields: color"):
+        parse_fields("route_name,color")
@@ -0,0 +1,37 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from status_export import EXPORT_COLUMNS, iter_csv, iter_ndjson, status_export_row
+
+STATUS = SimpleNamespace(
+    id=1, driver_id=2, route_code="T101", direction="inbound",
+    latitude=14.6, longitude=121.0, crowd_level="full",
+    current_passenger_count=18,
+    reported_at=datetime(2026, 10, 19, 17, 33, 7, tzinfo=timezone.utc),
+)
+
+
+def test_status_export_row_uses_iso_timestamps():
+    row = status_export_row(STATUS)
+    assert list(row) == EXPORT_COLUMNS
+    assert row["reported_at"] == "2026-10-19T17:33:07+00:00"
+
+
+def test_iter_ndjson():
+    lines = "".join(iter_ndjson([status_export_row(STATUS)] * 2)).splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["reported_at"] == "2026-10-19T17:33:07+00:00"
+
+
+def test_iter_csv():
+    body = "".join(iter_csv([status_export_row(STATUS)]))
+    rows = list(csv.DictReader(io.StringIO(body)))
+    assert rows[0]["route_code"] == "T101"
+    assert rows[0]["reported_at"] == "2026-10-19T17:33:07+00:00"
+
+
+def test_iter_csv_without_rows_still_has_header():
+    assert "".join(iter_csv([])).strip() == ",".join(EXPORT_COLUMNS)